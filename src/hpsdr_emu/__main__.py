@@ -6,6 +6,7 @@ import argparse
 import asyncio
 import logging
 import signal
+import sys
 
 from .radio import RADIO_CHOICES, EchoBuffer, RadioState, SignalGenerator
 
@@ -106,19 +107,41 @@ def main() -> None:
         "on" if echo else "off",
     )
 
+    loop_factory = _event_loop_factory()
+
     try:
         if args.protocol == 1:
             from .protocol1 import run_protocol1
 
-            asyncio.run(_run_with_shutdown(run_protocol1(state, siggen, echo)))
+            asyncio.run(
+                _run_with_shutdown(run_protocol1(state, siggen, echo)),
+                loop_factory=loop_factory,
+            )
         else:
             from .protocol2 import run_protocol2
 
-            asyncio.run(_run_with_shutdown(run_protocol2(state, siggen, echo)))
+            asyncio.run(
+                _run_with_shutdown(run_protocol2(state, siggen, echo)),
+                loop_factory=loop_factory,
+            )
     except KeyboardInterrupt:
         pass
 
 
+def _event_loop_factory():
+    """Return uvloop's loop factory if installed, else None (default loop)."""
+    try:
+        import uvloop
+    except ImportError:
+        if sys.platform == "win32":
+            # Both protocol servers drive their sockets with add_reader(),
+            # which the default Proactor loop doesn't implement
+            return asyncio.SelectorEventLoop
+        return None
+    logging.getLogger(__name__).info("Using uvloop event loop")
+    return uvloop.new_event_loop
+
+
 async def _run_with_shutdown(coro) -> None:
     """Run coroutine with graceful SIGINT/SIGTERM handling."""
     loop = asyncio.get_running_loop()
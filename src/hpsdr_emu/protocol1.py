@@ -2,21 +2,35 @@
 
 Listens on UDP port 1024. Handles discovery, start/stop, control commands,
 and streams I/Q data back to the client.
+
+The server drives its socket directly (``loop.add_reader`` and a recvfrom
+drain loop) rather than through a DatagramProtocol, so a burst of host
+packets is handled in one wakeup.
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import socket
 import struct
+import types
+from collections.abc import Callable
+
+import numpy as np
 
 from .radio import (
     SAMPLE_RATES_P1,
     EchoBuffer,
     RadioState,
     SignalGenerator,
+    numba_kernel,
     unpack_tx_iq_16bit,
+    warm_up_kernel,
 )
+from .stream import BurstStreamer
+from .udp import BatchSender, bind_udp_socket, tune_socket_buffers
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +39,18 @@ PACKET_SIZE = 1032
 SUBFRAME_SIZE = 512
 SYNC = b"\x7f\x7f\x7f"
 
+# Streaming sends are batched into one sendmmsg() per ~5 ms of samples
+SEND_BATCH_WINDOW = 0.005
+MAX_SEND_BATCH = 32
+
 # Response C0 addresses the radio rotates through (matched to Thetis parsing)
 _RESPONSE_ADDRS = [0x00, 0x08, 0x10, 0x18]
 
+# Host C0 addresses carrying RX frequencies: 0x04=RX0, 0x06=RX1, ... 0x10=RX6
+_RX_FREQ_ADDRS = frozenset(range(0x04, 0x12, 2))
 
-class Protocol1Server(asyncio.DatagramProtocol):
+
+class Protocol1Server:
     """Protocol 1 UDP handler."""
 
     def __init__(
@@ -41,13 +62,51 @@ class Protocol1Server(asyncio.DatagramProtocol):
         self.state = state
         self.siggen = siggen
         self.echo = echo
-        self.transport: asyncio.DatagramTransport | None = None
+        self.sock: socket.socket | None = None
+        self._sender: BatchSender | None = None
         self.client_addr: tuple[str, int] | None = None
         self._stream_task: asyncio.Task | None = None
-        self._control_idx = 0  # rotating C0 index for responses
-
-    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
-        self.transport = transport
+        self._pkt_idx = 0  # position in the response header pair cycle
+        self._next_data_seq = state.seq_counter("p1_data")
+        # Seconds of samples per packet and an nddc-specialized _fill_subframe;
+        # refreshed on sample rate / nddc change
+        self._packet_interval = 0.0
+        self._set_stream_params()
+        # Two banks of packet buffers reused for every burst (the kernel copies
+        # on send): one is sent while the worker fills the other
+        self._pkt_bufs = [
+            [self._new_packet_buffer() for _ in range(MAX_SEND_BATCH)] for _ in range(2)
+        ]
+        self._streamer = BurstStreamer("p1")
+        # Prebuilt (sub-frame 0, sub-frame 1) sync + C0-C4 headers for each
+        # packet in the response rotation and PTT state; rebuilt on drive change
+        self._header_table: list[tuple[bytes, bytes]] = self._build_header_table()
+
+    def attach(self, sock: socket.socket) -> None:
+        """Take over a bound, non-blocking UDP socket."""
+        self.sock = sock
+        tune_socket_buffers(sock)
+        self._sender = BatchSender(sock=sock)
+
+    def close(self) -> None:
+        self._handle_stop()
+        if self._sender is not None:
+            self._sender.close()
+        self._streamer.close()
+
+    def _on_readable(self) -> None:
+        """Drain every queued datagram in one wakeup."""
+        sock = self.sock
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # e.g. ICMP port unreachable from a client that went away
+                logger.debug("P1 recvfrom failed: %s", e)
+                return
+            self.datagram_received(data, addr)
 
     def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
         if len(data) < 4:
@@ -76,10 +135,10 @@ class Protocol1Server(asyncio.DatagramProtocol):
     def _handle_discovery(self, addr: tuple[str, int]) -> None:
         logger.info("P1 Discovery request from %s", addr)
         resp = self._build_discovery_response()
-        self.transport.sendto(resp, addr)
+        self.sock.sendto(resp, addr)
         logger.info("P1 Discovery response sent (%d bytes)", len(resp))
 
-    def _build_discovery_response(self) -> bytes:
+    def _build_discovery_response(self) -> bytearray:
         """Build 60-byte Protocol 1 discovery response."""
         buf = bytearray(60)
         s = self.state
@@ -100,12 +159,13 @@ class Protocol1Server(asyncio.DatagramProtocol):
         buf[19] = s.metis_version
         buf[20] = s.nddc  # number of receivers
 
-        return bytes(buf)
+        return buf
 
     def _handle_start(self, addr: tuple[str, int]) -> None:
         logger.info("P1 Start streaming to %s", addr)
         self.client_addr = addr
         self.state.running = True
+        self._set_stream_params()
         if self._stream_task is None or self._stream_task.done():
             self._stream_task = asyncio.ensure_future(self._stream_loop())
 
@@ -128,8 +188,7 @@ class Protocol1Server(asyncio.DatagramProtocol):
             sf = data[offset : offset + SUBFRAME_SIZE]
             if sf[0:3] != SYNC:
                 continue
-            c0, c1, c2, c3, c4 = sf[3], sf[4], sf[5], sf[6], sf[7]
-            self._process_control(c0, c1, c2, c3, c4)
+            self._process_control(sf)
 
             # Extract TX IQ from sub-frame data (after 8-byte header)
             # 63 blocks of [L(2B) R(2B) I(2B) Q(2B)] = 504 bytes
@@ -139,12 +198,13 @@ class Protocol1Server(asyncio.DatagramProtocol):
                     tx_iq = unpack_tx_iq_16bit(tx_data)
                     self.echo.feed(tx_iq)
 
-    def _process_control(self, c0: int, c1: int, c2: int, c3: int, c4: int) -> None:
-        """Process a C0-C4 control command from the host.
+    def _process_control(self, sf: bytes) -> None:
+        """Process the C0-C4 control command (bytes 3-7) of a host sub-frame.
 
         C0 bit 0 = MOX (PTT), bits [7:1] = command address.
         """
         s = self.state
+        c0, c1, c4 = sf[3], sf[4], sf[7]
 
         # Extract MOX from bit 0, address from remaining bits
         mox = bool(c0 & 0x01)
@@ -168,22 +228,24 @@ class Protocol1Server(asyncio.DatagramProtocol):
                         logger.info("P1 Sample rate -> %d Hz", rate)
                         s.sample_rate = rate
                         self.siggen.sample_rate = rate
+                        self._set_stream_params()
                     break
             # Number of receivers: C4 bits [5:3] = (nddc - 1)
             nddc = ((c4 >> 3) & 0x07) + 1
             if nddc != s.nddc:
                 logger.info("P1 Active DDCs -> %d", nddc)
                 s.nddc = nddc
+                self._set_stream_params()
         elif addr == 0x02:
             # TX frequency
-            freq = struct.unpack(">I", bytes([c1, c2, c3, c4]))[0]
+            freq = int.from_bytes(sf[4:8], "big")
             if s.tx_frequency != freq:
                 logger.info("P1 TX freq -> %d Hz", freq)
                 s.tx_frequency = freq
-        elif addr in range(0x04, 0x12, 2):
+        elif addr in _RX_FREQ_ADDRS:
             # RX frequencies: 0x04=RX0, 0x06=RX1, 0x08=RX2, ...
             ddc_idx = (addr - 0x04) // 2
-            freq = struct.unpack(">I", bytes([c1, c2, c3, c4]))[0]
+            freq = int.from_bytes(sf[4:8], "big")
             if ddc_idx < len(s.rx_frequencies) and s.rx_frequencies[ddc_idx] != freq:
                 logger.info("P1 RX%d freq -> %d Hz", ddc_idx, freq)
                 s.rx_frequencies[ddc_idx] = freq
@@ -193,6 +255,19 @@ class Protocol1Server(asyncio.DatagramProtocol):
             if s.tx_drive != drive:
                 logger.info("P1 TX drive -> %d", drive)
                 s.tx_drive = drive
+                self._header_table = self._build_header_table()
+
+    def _set_stream_params(self) -> None:
+        """Recompute the packet interval (seconds) for the nddc and sample rate.
+
+        Also installs the _fill_subframe generated for the new geometry.
+        """
+        nddc = max(1, self.state.nddc)
+        spr = 504 // (6 * nddc + 2)
+        samples_per_packet = spr * 2  # 2 sub-frames
+        self._packet_interval = samples_per_packet / self.state.sample_rate
+        fill = _make_fill_subframe(nddc, spr, self.echo is not None)
+        self._fill_subframe = types.MethodType(fill, self)
 
     async def _stream_loop(self) -> None:
         """Stream I/Q data packets to the client."""
@@ -202,59 +277,78 @@ class Protocol1Server(asyncio.DatagramProtocol):
             self.state.sample_rate,
         )
         try:
-            while self.state.running and self.client_addr:
-                packet = self._build_data_packet()
-                self.transport.sendto(packet, self.client_addr)
-
-                # Calculate sleep time based on samples per packet
-                nddc = max(1, self.state.nddc)
-                spr = 504 // (6 * nddc + 2)
-                samples_per_packet = spr * 2  # 2 sub-frames
-                interval = samples_per_packet / self.state.sample_rate
-                await asyncio.sleep(interval)
+            await self._streamer.run(
+                self._build_batch,
+                self._send_batch,
+                lambda: self.state.running and self.client_addr is not None,
+            )
         except asyncio.CancelledError:
             logger.info("P1 Streaming cancelled")
         except Exception:
             logger.exception("P1 Streaming error")
 
-    def _build_data_packet(self) -> bytes:
-        """Build a 1032-byte Protocol 1 data packet."""
-        buf = bytearray(PACKET_SIZE)
-        s = self.state
-        seq = s.next_seq("p1_data")
+    def _send_batch(self, batch: list[bytearray]) -> None:
+        # One burst covering ~SEND_BATCH_WINDOW, in one syscall
+        if self.client_addr:
+            self._sender.send(batch, self.client_addr)
+
+    def _build_batch(self, bank: int, due: float) -> tuple[list[bytearray], float]:
+        """Build one burst of data packets into a buffer bank (worker thread).
+
+        Returns the packets and the seconds of samples they cover; ``due`` is
+        unused, as P1 packets carry no timestamp. The geometry is read once,
+        so a concurrent nddc or sample rate change can't mix two geometries in
+        one burst or pace it with another's interval.
+        """
+        interval = self._packet_interval
+        fill = self._fill_subframe
+        n = min(MAX_SEND_BATCH, max(1, int(SEND_BATCH_WINDOW / interval)))
+        bufs = self._pkt_bufs[bank]
+        return [self._build_data_packet(bufs[k], fill) for k in range(n)], n * interval
+
+    def _build_data_packet(
+        self, buf: bytearray, fill: Callable[[bytearray, int], None]
+    ) -> bytearray:
+        """Fill a reusable 1032-byte Protocol 1 data packet buffer.
+
+        The fixed header bytes are stamped once in _new_packet_buffer(); the
+        sub-frame I/Q data is written by ``fill``, a bound _fill_subframe.
+        """
+        struct.pack_into(">I", buf, 4, self._next_data_seq())
+
+        # Sync + control response (C0-C4) for both sub-frames.
+        # Rotate through the 4 response addresses Thetis expects.
+        hdr0, hdr1 = self._header_table[(self._pkt_idx << 1) | self.state.ptt]
+        self._pkt_idx = (self._pkt_idx + 1) % len(_RESPONSE_ADDRS)
+        buf[8:16] = hdr0
+        buf[520:528] = hdr1
 
-        # Header
+        # Sub-frame I/Q data
+        for sf_offset in (8, 520):
+            fill(buf, sf_offset)
+
+        return buf
+
+    @staticmethod
+    def _new_packet_buffer() -> bytearray:
+        buf = bytearray(PACKET_SIZE)
         buf[0] = 0xEF
         buf[1] = 0xFE
         buf[2] = 0x01  # data packet
         buf[3] = 0x06  # endpoint 6
-        struct.pack_into(">I", buf, 4, seq)
-
-        # Build both sub-frames
-        for sf_offset in (8, 520):
-            self._fill_subframe(buf, sf_offset)
-
-        return bytes(buf)
+        return buf
 
-    def _fill_subframe(self, buf: bytearray, offset: int) -> None:
-        """Fill a 512-byte sub-frame with sync, control response, and I/Q data."""
+    def _build_subframe_header(self, c0_addr: int, ptt: bool) -> bytes:
+        """Build the 8-byte sub-frame header: sync + C0-C4 control response."""
         s = self.state
-        nddc = max(1, s.nddc)
-        spr = 504 // (6 * nddc + 2)
+        buf = bytearray(8)
 
         # Sync bytes
-        buf[offset] = 0x7F
-        buf[offset + 1] = 0x7F
-        buf[offset + 2] = 0x7F
-
-        # Control response bytes (C0-C4)
-        # Rotate through the 4 response addresses Thetis expects
-        c0_addr = _RESPONSE_ADDRS[self._control_idx % len(_RESPONSE_ADDRS)]
-        self._control_idx = (self._control_idx + 1) % len(_RESPONSE_ADDRS)
+        buf[0:3] = SYNC
 
-        ptt_bit = 1 if s.ptt else 0
+        ptt_bit = 1 if ptt else 0
         c0 = c0_addr | 0x80 | ptt_bit
-        buf[offset + 3] = c0
+        buf[3] = c0
 
         # Fill C1-C4 based on response address
         if c0_addr == 0x00:
@@ -262,63 +356,152 @@ class Protocol1Server(asyncio.DatagramProtocol):
             # C2: Mercury software version
             # C3: Penny version
             # C4: reserved
-            buf[offset + 4] = 0x00
-            buf[offset + 5] = s.firmware_version
-            buf[offset + 6] = s.penny_version
-            buf[offset + 7] = 0x00
+            buf[4] = 0x00
+            buf[5] = s.firmware_version
+            buf[6] = s.penny_version
+            buf[7] = 0x00
         elif c0_addr == 0x08:
             # C1-C2: Exciter power (AIN5), C3-C4: Forward power (AIN1)
-            if s.ptt:
+            if ptt:
                 exc = s.tx_drive * 10
                 fwd = (s.tx_drive * s.tx_drive) >> 4
             else:
                 exc = 0
                 fwd = 0
-            struct.pack_into(">HH", buf, offset + 4, exc, fwd)
+            struct.pack_into(">HH", buf, 4, exc, fwd)
         elif c0_addr == 0x10:
             # C1-C2: Reverse power (AIN2), C3-C4: PA volts (AIN3)
-            if s.ptt and s.tx_drive > 0:
+            if ptt and s.tx_drive > 0:
                 fwd = (s.tx_drive * s.tx_drive) >> 4
                 rev = max(1, fwd // 50)
             else:
                 rev = 0
             supply = 3200  # ~13.2 V equivalent
-            struct.pack_into(">HH", buf, offset + 4, rev, supply)
+            struct.pack_into(">HH", buf, 4, rev, supply)
         elif c0_addr == 0x18:
             # C1-C2: PA current (AIN4), C3-C4: Supply volts (AIN6)
-            pa_amps = s.tx_drive * 5 if s.ptt else 0
+            pa_amps = s.tx_drive * 5 if ptt else 0
             supply = 3200
-            struct.pack_into(">HH", buf, offset + 4, pa_amps, supply)
+            struct.pack_into(">HH", buf, 4, pa_amps, supply)
         else:
-            buf[offset + 4 : offset + 8] = b"\x00\x00\x00\x00"
+            buf[4:8] = b"\x00\x00\x00\x00"
+
+        return bytes(buf)
+
+    def _build_header_table(self) -> list[tuple[bytes, bytes]]:
+        """Build the per-packet (sub-frame 0, sub-frame 1) header table.
+
+        Sub-frames take consecutive entries of _RESPONSE_ADDRS, two per packet.
+        Entry (packet index << 1) | ptt holds the pair for that PTT state, so a
+        PTT toggle needs no rebuild.
+        """
+        n = len(_RESPONSE_ADDRS)
+        table = []
+        for i in range(n):
+            for ptt in (False, True):
+                a0 = _RESPONSE_ADDRS[(2 * i) % n]
+                a1 = _RESPONSE_ADDRS[(2 * i + 1) % n]
+                table.append(
+                    (
+                        self._build_subframe_header(a0, ptt),
+                        self._build_subframe_header(a1, ptt),
+                    )
+                )
+        return table
+
+
+def _pack_rows_numpy(
+    buf: bytearray, offset: int, ints: np.ndarray, spr: int, nddc: int
+) -> None:
+    """Pack (nddc, spr, 2) int24 I/Q as rows of [I(3B) Q(3B)] × nddc + [Mic(2B)]."""
+    # Big-endian int32 words; the low three bytes of each are the 24-bit value
+    words = ints.transpose(1, 0, 2).astype(">i4")  # (spr, nddc, 2)
 
-        # Generate samples in batch per DDC, then interleave into sub-frame
-        ddc_samples = []
+    row_size = nddc * 6 + 2
+    packed = np.zeros((spr, row_size), dtype=np.uint8)  # mic bytes stay 0
+    iq_bytes = packed[:, : nddc * 6].reshape(spr, nddc, 2, 3)
+    iq_bytes[:] = words.view(np.uint8).reshape(spr, nddc, 2, 4)[..., 1:]
+
+    buf[offset : offset + packed.nbytes] = packed.tobytes()
+
+
+def _pack_rows_24be(out, offset, ints, spr, nddc):
+    """Scalar form of _pack_rows_numpy over a uint8 view, compiled by Numba."""
+    pos = offset
+    for row in range(spr):
         for ddc in range(nddc):
-            if self.echo is not None:
-                iq = self.echo.generate_echo(spr, s.rx_frequencies[ddc], s.sample_rate)
-            else:
-                iq = self.siggen.generate_iq(spr, ddc)
-            ddc_samples.append(iq)
-
-        # Pack interleaved: [I(3B) Q(3B)] × nddc + [Mic(2B)] per sample row
-        data_offset = offset + 8
-        for row in range(spr):
-            for ddc in range(nddc):
-                sample = ddc_samples[ddc][row]
-                iv = int(max(-1.0, min(1.0, sample.real)) * 8388607) & 0xFFFFFF
-                qv = int(max(-1.0, min(1.0, sample.imag)) * 8388607) & 0xFFFFFF
-                buf[data_offset] = (iv >> 16) & 0xFF
-                buf[data_offset + 1] = (iv >> 8) & 0xFF
-                buf[data_offset + 2] = iv & 0xFF
-                buf[data_offset + 3] = (qv >> 16) & 0xFF
-                buf[data_offset + 4] = (qv >> 8) & 0xFF
-                buf[data_offset + 5] = qv & 0xFF
-                data_offset += 6
-            # Mic: 2 bytes silence
-            buf[data_offset] = 0
-            buf[data_offset + 1] = 0
-            data_offset += 2
+            iv = ints[ddc, row, 0]
+            qv = ints[ddc, row, 1]
+            out[pos] = (iv >> 16) & 0xFF
+            out[pos + 1] = (iv >> 8) & 0xFF
+            out[pos + 2] = iv & 0xFF
+            out[pos + 3] = (qv >> 16) & 0xFF
+            out[pos + 4] = (qv >> 8) & 0xFF
+            out[pos + 5] = qv & 0xFF
+            pos += 6
+        # Mic: 2 bytes silence
+        out[pos] = 0
+        out[pos + 1] = 0
+        pos += 2
+
+
+@functools.cache
+def _load_packer():
+    """Return the Numba-compiled row packer, or _pack_rows_numpy without Numba."""
+    kernel = numba_kernel(_pack_rows_24be)
+    if kernel is None:
+        return _pack_rows_numpy
+
+    def pack_rows(
+        buf: bytearray, offset: int, ints: np.ndarray, spr: int, nddc: int
+    ) -> None:
+        kernel(np.frombuffer(buf, dtype=np.uint8), offset, ints, spr, nddc)
+
+    return pack_rows
+
+
+@functools.cache
+def _make_fill_subframe(nddc: int, spr: int, echo: bool):
+    """Generate Protocol1Server._fill_subframe for a fixed geometry.
+
+    The generated method fills the I/Q data of a 512-byte sub-frame at
+    ``offset`` (header written by the caller): it generates ``spr`` pre-scaled
+    samples per DDC (from the echo buffer when ``echo``, else the signal
+    generator), packs them as rows of [I(3B) Q(3B)] × nddc + [Mic(2B)] and
+    zeroes the unused tail, since buffers are reused across nddc changes.
+    The per-DDC calls, array shapes and tail padding are emitted as
+    constants, so the hot path has no DDC loop or index arithmetic. The
+    generated function is cached per (nddc, spr, echo).
+    """
+    tail = SUBFRAME_SIZE - 8 - spr * (6 * nddc + 2)
+    lines = [
+        "def fill_subframe(self, buf, offset):",
+        "    s = self.state",
+        f"    ints = np.empty(({nddc}, {spr}, 2), dtype=np.int32)",
+    ]
+    for ddc in range(nddc):
+        if echo:
+            lines.append(
+                f"    ints[{ddc}] = self.echo.generate_echo_int24("
+                f"{spr}, s.rx_frequencies[{ddc}], s.sample_rate)"
+            )
+        else:
+            lines.append(
+                f"    ints[{ddc}] = self.siggen.generate_iq_int24({spr}, {ddc})"
+            )
+    lines.append(f"    _pack_rows(buf, offset + 8, ints, {spr}, {nddc})")
+    if tail:
+        start = SUBFRAME_SIZE - tail
+        lines.append(
+            f"    buf[offset + {start} : offset + {SUBFRAME_SIZE}] = {bytes(tail)!r}"
+        )
+
+    # Trusted source: every line is generated above. Take the function's code
+    # object from the compiled module rather than running the module itself.
+    module = compile("\n".join(lines), f"<fill_subframe nddc={nddc}>", "exec")
+    code = next(c for c in module.co_consts if isinstance(c, types.CodeType))
+    namespace = {"np": np, "_pack_rows": _load_packer()}
+    return types.FunctionType(code, namespace)
 
 
 async def run_protocol1(
@@ -327,11 +510,19 @@ async def run_protocol1(
     echo: EchoBuffer | None = None,
 ) -> None:
     """Start Protocol 1 server."""
-    loop = asyncio.get_running_loop()
-    transport, protocol = await loop.create_datagram_endpoint(
-        lambda: Protocol1Server(state, siggen, echo),
-        local_addr=("0.0.0.0", PORT),
+    warm_up_kernel(
+        _pack_rows_24be,
+        np.zeros(SUBFRAME_SIZE, np.uint8),
+        8,
+        np.zeros((1, 1, 2), np.int32),
+        1,
+        1,
     )
+    loop = asyncio.get_running_loop()
+    sock = bind_udp_socket(PORT)
+    server = Protocol1Server(state, siggen, echo)
+    server.attach(sock)
+    loop.add_reader(sock.fileno(), server._on_readable)
     logger.info("Protocol 1 listening on UDP port %d", PORT)
     logger.info(
         "Radio: %s (code=%d, DDCs=%d)",
@@ -344,4 +535,6 @@ async def run_protocol1(
     try:
         await asyncio.Event().wait()  # run forever
     finally:
-        transport.close()
+        loop.remove_reader(sock.fileno())
+        server.close()
+        sock.close()
@@ -2,14 +2,18 @@
 
 Listens on UDP ports 1024-1029 for host commands.
 Sends DDC IQ data on ports 1035+, high-priority status on 1025, mic on 1026.
+
+Each port is a plain non-blocking socket driven by ``loop.add_reader``;
+datagrams are received into a reusable per-port buffer and handed to the
+port handlers as memoryviews, so no bytes object is allocated per packet.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import socket
 import struct
-import time
 
 import numpy as np
 
@@ -20,7 +24,10 @@ from .radio import (
     pack_iq_24bit_fast,
     unpack_tx_audio_16bit,
     unpack_tx_iq_24bit,
+    warm_up_iq_kernels,
 )
+from .stream import BurstStreamer, Deadline
+from .udp import BatchSender, bind_udp_socket, tune_socket_buffers
 
 logger = logging.getLogger(__name__)
 
@@ -38,23 +45,53 @@ PORT_MIC = 1026
 PORT_DDC_BASE = 1035
 
 SAMPLES_PER_DDC_PACKET = 238
+DDC_HEADER_SIZE = 16
+DDC_PACKET_SIZE = DDC_HEADER_SIZE + SAMPLES_PER_DDC_PACKET * 6
+# DDC packets built and sent back to back, per DDC, per scheduler wakeup
+DDC_BURST = 8
 SAMPLES_PER_MIC_PACKET = 64
 HP_STATUS_INTERVAL = 0.1  # 10 Hz
+# No TX data for this long (s) ends an echo recording (client vanished)
+ECHO_TX_TIMEOUT = 1.0
+# TX samples gathered before one EchoBuffer.feed() (8 × 240-sample TX IQ packets)
+TX_FEED_SAMPLES = 240 * 8
 
+# Receive buffer per port; host packets are at most 1444 bytes
+RECV_BUFFER_SIZE = 2048
 
-class _PortHandler(asyncio.DatagramProtocol):
-    """Base UDP handler that dispatches to the Protocol2Server."""
 
-    def __init__(self, server: Protocol2Server, port: int) -> None:
-        self.server = server
-        self.port = port
-        self.transport: asyncio.DatagramTransport | None = None
+# Precompiled packers for the per-packet header fields
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_RX_FREQS = struct.Struct(">12I")  # high-priority bytes 9-56
+_HP_STATUS = struct.Struct(">IBxH6xH6xH")  # seq, PTT, exciter, forward, reverse
+_DDC_SEQ_TS = struct.Struct(">Iq")  # DDC header: sequence, timestamp
 
-    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
-        self.transport = transport
 
-    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
-        self.server.handle_packet(self.port, data, addr)
+class _PortHandler:
+    """UDP receiver for one port that dispatches to the Protocol2Server.
+
+    The memoryview passed on is only valid until the handler returns.
+    """
+
+    def __init__(self, server: Protocol2Server, port: int, sock: socket.socket) -> None:
+        self.server = server
+        self.port = port
+        self.sock = sock
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+
+    def on_readable(self) -> None:
+        """Pass each queued datagram to the server until the socket is empty."""
+        while True:
+            try:
+                n, addr = self.sock.recvfrom_into(self._recv_buf)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug("P2 recvfrom on port %d failed: %s", self.port, e)
+                return
+            self.server.handle_packet(self.port, self._recv_view[:n], addr)
 
 
 class Protocol2Server:
@@ -71,33 +108,53 @@ class Protocol2Server:
         self.echo = echo
         self.client_addr: tuple[str, int] | None = None
         self._handlers: dict[int, _PortHandler] = {}
+        # Host packet handler per listening port
+        self._dispatch = {
+            PORT_GENERAL: self._handle_general,
+            PORT_RX_SPECIFIC: self._handle_rx_specific,
+            PORT_TX_SPECIFIC: self._handle_tx_specific,
+            PORT_HIGH_PRIORITY: self._handle_high_priority,
+            PORT_TX_AUDIO: self._handle_tx_audio,
+            PORT_TX_IQ: self._handle_tx_iq,
+        }
         self._stream_tasks: list[asyncio.Task] = []
         # Per-source-port send sockets (deskHPSDR demuxes by source port)
-        self._send_sockets: dict[int, asyncio.DatagramTransport] = {}
+        self._send_sockets: dict[int, socket.socket] = {}
+        self._senders: dict[int, BatchSender] = {}
+        # Two banks of DDC packet buffers (one burst per DDC each), constant
+        # header fields prefilled: one is sent while the worker fills the other
+        self._ddc_bufs = [
+            [
+                [self._new_ddc_buffer() for _ in range(DDC_BURST)]
+                for _ in range(state.nddc)
+            ]
+            for _ in range(2)
+        ]
+        self._streamer = BurstStreamer("p2")
+        self._ddc_seqs = [state.seq_counter(f"ddc_{ddc}") for ddc in range(state.nddc)]
+        self._next_mic_seq = state.seq_counter("mic")
+        self._mic_buf = bytearray(4 + SAMPLES_PER_MIC_PACKET * 2)
+        self._hp_buf = bytearray(60)
+        # RX frequency words from the last high-priority packet
+        self._hp_rx_freqs: tuple[int, ...] = ()
+        # Discovery reply; every field comes from startup-time state
+        self._discovery_resp = bytearray()
         # Echo TX detection: TX data presence with timeout
         self._echo_tx_active: bool = False
         self._echo_tx_timer: asyncio.TimerHandle | None = None
+        self._echo_last_tx = 0.0  # loop.time() of the latest TX data
+        # TX samples not yet fed to the echo buffer
+        self._tx_scratch = np.empty(TX_FEED_SAMPLES, dtype=np.complex64)
+        self._tx_fill = 0
 
     async def start(self) -> None:
         """Bind all ports and start listening."""
         loop = asyncio.get_running_loop()
+        self._discovery_resp = self._build_discovery_response()
 
-        ports = [
-            PORT_GENERAL,
-            PORT_RX_SPECIFIC,
-            PORT_TX_SPECIFIC,
-            PORT_HIGH_PRIORITY,
-            PORT_TX_AUDIO,
-            PORT_TX_IQ,
-        ]
-
-        for port in ports:
-            handler = _PortHandler(self, port)
-            transport, _ = await loop.create_datagram_endpoint(
-                lambda h=handler: h,
-                local_addr=("0.0.0.0", port),
-            )
-            handler.transport = transport
+        for port in self._dispatch:
+            handler = _PortHandler(self, port, bind_udp_socket(port))
+            loop.add_reader(handler.sock.fileno(), handler.on_readable)
             self._handlers[port] = handler
             logger.info("Protocol 2 listening on UDP port %d", port)
 
@@ -105,18 +162,21 @@ class Protocol2Server:
         # deskHPSDR demultiplexes incoming packets by source port:
         #   1025 = HP status, 1026 = mic, 1035+ = DDC IQ
         # Ports 1025/1026 are already bound by receive handlers — reuse them.
-        self._send_sockets[PORT_HP_STATUS] = self._handlers[PORT_RX_SPECIFIC].transport
-        self._send_sockets[PORT_MIC] = self._handlers[PORT_TX_SPECIFIC].transport
+        self._send_sockets[PORT_HP_STATUS] = self._handlers[PORT_RX_SPECIFIC].sock
+        self._send_sockets[PORT_MIC] = self._handlers[PORT_TX_SPECIFIC].sock
         # DDC IQ ports (1035+) need new sockets.
         for ddc in range(self.state.nddc):
             sport = PORT_DDC_BASE + ddc
-            transport, _ = await loop.create_datagram_endpoint(
-                asyncio.DatagramProtocol,
-                local_addr=("0.0.0.0", sport),
-            )
-            self._send_sockets[sport] = transport
+            self._send_sockets[sport] = bind_udp_socket(sport)
             logger.info("Protocol 2 send socket on port %d", sport)
 
+        for handler in self._handlers.values():
+            tune_socket_buffers(handler.sock)
+        for sport, sock in self._send_sockets.items():
+            if sport >= PORT_DDC_BASE:
+                tune_socket_buffers(sock)
+            self._senders[sport] = BatchSender(sock=sock)
+
         logger.info(
             "Radio: %s (code=%d, DDCs=%d)",
             self.state.hw.name,
@@ -125,38 +185,28 @@ class Protocol2Server:
         )
         logger.info("MAC: %s", ":".join(f"{b:02x}" for b in self.state.mac))
 
-    def handle_packet(self, port: int, data: bytes, addr: tuple[str, int]) -> None:
+    def handle_packet(self, port: int, data: memoryview, addr: tuple[str, int]) -> None:
         """Dispatch incoming packet by port."""
-        if port == PORT_GENERAL:
-            self._handle_general(data, addr)
-        elif port == PORT_RX_SPECIFIC:
-            self._handle_rx_specific(data, addr)
-        elif port == PORT_TX_SPECIFIC:
-            self._handle_tx_specific(data, addr)
-        elif port == PORT_HIGH_PRIORITY:
-            self._handle_high_priority(data, addr)
-        elif port == PORT_TX_AUDIO:
-            self._handle_tx_audio(data, addr)
-        elif port == PORT_TX_IQ:
-            self._handle_tx_iq(data, addr)
+        handler = self._dispatch.get(port)
+        if handler is not None:
+            handler(data, addr)
 
     # --- Port handlers ---
 
-    def _handle_general(self, data: bytes, addr: tuple[str, int]) -> None:
+    def _handle_general(self, data: memoryview, addr: tuple[str, int]) -> None:
         if len(data) < 5:
             return
 
         # Check if discovery (byte 4 == 0x02)
         if data[4] == 0x02:
             logger.info("P2 Discovery request from %s", addr)
-            resp = self._build_discovery_response()
-            self._handlers[PORT_GENERAL].transport.sendto(resp, addr)
+            self._handlers[PORT_GENERAL].sock.sendto(self._discovery_resp, addr)
             logger.info("P2 Discovery response sent")
         elif data[4] == 0x00:
             logger.debug("P2 General config from %s", addr)
             self.client_addr = addr
 
-    def _build_discovery_response(self) -> bytes:
+    def _build_discovery_response(self) -> bytearray:
         """Build 60-byte Protocol 2 discovery response."""
         buf = bytearray(60)
         s = self.state
@@ -175,9 +225,9 @@ class Protocol2Server:
         buf[19] = s.metis_version
         buf[20] = s.nddc  # number of receivers
 
-        return bytes(buf)
+        return buf
 
-    def _handle_rx_specific(self, data: bytes, addr: tuple[str, int]) -> None:
+    def _handle_rx_specific(self, data: memoryview, addr: tuple[str, int]) -> None:
         if len(data) < 5:
             return
         self.client_addr = addr
@@ -186,14 +236,14 @@ class Protocol2Server:
         # Parse enabled receivers (byte 7)
         if len(data) > 7:
             enabled_bits = data[7]
-            count = bin(enabled_bits).count("1")
+            count = enabled_bits.bit_count()
             if count > 0 and count != self.state.nddc:
                 logger.info("P2 Enabled RXs: %d (bits=0x%02x)", count, enabled_bits)
 
         # Parse per-receiver sample rate from byte 18-19 (RX0)
         # Value is in kHz (e.g., 192 for 192000 Hz)
         if len(data) > 19:
-            sr_khz = struct.unpack(">H", data[18:20])[0]
+            sr_khz = _U16.unpack_from(data, 18)[0]
             if sr_khz > 0:
                 sr_hz = sr_khz * 1000
                 if sr_hz != self.state.sample_rate:
@@ -201,11 +251,11 @@ class Protocol2Server:
                     self.state.sample_rate = sr_hz
                     self.siggen.sample_rate = sr_hz
 
-    def _handle_tx_specific(self, data: bytes, addr: tuple[str, int]) -> None:
+    def _handle_tx_specific(self, data: memoryview, addr: tuple[str, int]) -> None:
         self.client_addr = addr
         logger.debug("P2 TX-specific config from %s (%d bytes)", addr, len(data))
 
-    def _handle_high_priority(self, data: bytes, addr: tuple[str, int]) -> None:
+    def _handle_high_priority(self, data: memoryview, addr: tuple[str, int]) -> None:
         if len(data) < 57:
             return
         self.client_addr = addr
@@ -220,22 +270,22 @@ class Protocol2Server:
             self.state.ptt = ptt
             if self.echo is not None and not ptt and self._echo_tx_active:
                 self._cancel_echo_tx_timer()
-                self._echo_tx_active = False
-                self.echo.stop_recording()
-
-        # RX frequencies: bytes 9-56 (12 × 4 bytes)
-        for i in range(12):
-            off = 9 + i * 4
-            if off + 4 <= len(data):
-                freq = struct.unpack(">I", data[off : off + 4])[0]
-                if freq > 0 and i < len(self.state.rx_frequencies):
-                    if self.state.rx_frequencies[i] != freq:
-                        logger.info("P2 RX%d freq -> %d Hz", i, freq)
-                        self.state.rx_frequencies[i] = freq
+                self._stop_echo_recording()
+
+        # RX frequencies: bytes 9-56 (12 × 4 bytes), within the length checked
+        # above; usually identical to the previous packet's
+        freqs = _RX_FREQS.unpack_from(data, 9)
+        if freqs != self._hp_rx_freqs:
+            self._hp_rx_freqs = freqs
+            rx_freqs = self.state.rx_frequencies
+            for i, freq in enumerate(freqs):
+                if freq > 0 and i < len(rx_freqs) and rx_freqs[i] != freq:
+                    logger.info("P2 RX%d freq -> %d Hz", i, freq)
+                    rx_freqs[i] = freq
 
         # TX frequency at byte 329
         if len(data) > 332:
-            tx_freq = struct.unpack(">I", data[329:333])[0]
+            tx_freq = _U32.unpack_from(data, 329)[0]
             if tx_freq > 0 and self.state.tx_frequency != tx_freq:
                 logger.info("P2 TX freq -> %d Hz", tx_freq)
                 self.state.tx_frequency = tx_freq
@@ -257,7 +307,7 @@ class Protocol2Server:
             logger.info("P2 RUN -> stopped")
             self._stop_streaming()
 
-    def _handle_tx_audio(self, data: bytes, addr: tuple[str, int]) -> None:
+    def _handle_tx_audio(self, data: memoryview, addr: tuple[str, int]) -> None:
         self.client_addr = addr
         if self.echo is None or not self.state.ptt or len(data) <= 4:
             return
@@ -272,7 +322,7 @@ class Protocol2Server:
             return
         self._echo_feed_tx(tx_iq)
 
-    def _handle_tx_iq(self, data: bytes, addr: tuple[str, int]) -> None:
+    def _handle_tx_iq(self, data: memoryview, addr: tuple[str, int]) -> None:
         self.client_addr = addr
         if self.echo is None or not self.state.ptt or len(data) <= 4:
             return
@@ -281,19 +331,36 @@ class Protocol2Server:
 
     def _echo_feed_tx(self, tx_iq: np.ndarray) -> None:
         """Feed TX samples to echo buffer. PTT already verified by caller."""
+        loop = asyncio.get_running_loop()
+        self._echo_last_tx = loop.time()
         if not self._echo_tx_active:
             self._echo_tx_active = True
             self.echo.start_recording(self.state.tx_frequency)
-        self.echo.feed(tx_iq)
-        # Fallback timeout for abrupt client disconnect
-        self._reset_echo_tx_timer()
+            # Fallback timeout for abrupt client disconnect
+            self._cancel_echo_tx_timer()
+            self._echo_tx_timer = loop.call_later(
+                ECHO_TX_TIMEOUT, self._echo_tx_timeout
+            )
 
-    def _reset_echo_tx_timer(self) -> None:
-        """Reset the fallback TX data timeout."""
-        if self._echo_tx_timer is not None:
-            self._echo_tx_timer.cancel()
-        loop = asyncio.get_event_loop()
-        self._echo_tx_timer = loop.call_later(1.0, self._echo_tx_timeout)
+        # Gather several packets per feed(); flushed when full or on stop
+        n = len(tx_iq)
+        if self._tx_fill + n > TX_FEED_SAMPLES:
+            self._flush_echo_tx()
+        if n > TX_FEED_SAMPLES:
+            self.echo.feed(tx_iq)
+        else:
+            self._tx_scratch[self._tx_fill : self._tx_fill + n] = tx_iq
+            self._tx_fill += n
+
+    def _flush_echo_tx(self) -> None:
+        if self._tx_fill:
+            self.echo.feed(self._tx_scratch[: self._tx_fill])  # feed() copies
+            self._tx_fill = 0
+
+    def _stop_echo_recording(self) -> None:
+        self._flush_echo_tx()
+        self._echo_tx_active = False
+        self.echo.stop_recording()
 
     def _cancel_echo_tx_timer(self) -> None:
         if self._echo_tx_timer is not None:
@@ -301,26 +368,36 @@ class Protocol2Server:
             self._echo_tx_timer = None
 
     def _echo_tx_timeout(self) -> None:
-        """Fallback: no TX data for 1s → stop recording (client disconnect)."""
-        if self._echo_tx_active:
-            self._echo_tx_active = False
-            self.echo.stop_recording()
-            logger.info("P2 Echo: TX data timeout (fallback), recording stopped")
+        """Fallback: no TX data for 1s → stop recording (client disconnect).
+
+        The timer is armed once per recording rather than per TX packet; if
+        data arrived since, it re-arms for the rest of the timeout.
+        """
+        self._echo_tx_timer = None
+        if not self._echo_tx_active:
+            return
+        loop = asyncio.get_running_loop()
+        remaining = self._echo_last_tx + ECHO_TX_TIMEOUT - loop.time()
+        if remaining > 0:
+            self._echo_tx_timer = loop.call_later(remaining, self._echo_tx_timeout)
+            return
+        self._stop_echo_recording()
+        logger.info("P2 Echo: TX data timeout (fallback), recording stopped")
 
     # --- Streaming ---
 
     def _start_streaming(self) -> None:
         self._stop_streaming()
+        loop = asyncio.get_running_loop()
 
         # High-priority status at 10 Hz
-        self._stream_tasks.append(asyncio.ensure_future(self._hp_status_loop()))
+        self._stream_tasks.append(loop.create_task(self._hp_status_loop()))
 
         # DDC IQ streams
-        for ddc in range(self.state.nddc):
-            self._stream_tasks.append(asyncio.ensure_future(self._ddc_iq_loop(ddc)))
+        self._stream_tasks.append(loop.create_task(self._ddc_iq_loop()))
 
         # Mic samples
-        self._stream_tasks.append(asyncio.ensure_future(self._mic_loop()))
+        self._stream_tasks.append(loop.create_task(self._mic_loop()))
 
         logger.info(
             "P2 Started %d stream tasks (nddc=%d)",
@@ -334,11 +411,11 @@ class Protocol2Server:
                 task.cancel()
         self._stream_tasks.clear()
 
-    def _send_to_client(self, source_port: int, data: bytes) -> None:
+    def _send_to_client(self, source_port: int, data: bytes | bytearray) -> None:
         """Send data to client FROM the specified source port."""
-        sock = self._send_sockets.get(source_port)
-        if self.client_addr and sock:
-            sock.sendto(data, self.client_addr)
+        sender = self._senders.get(source_port)
+        if self.client_addr and sender:
+            sender.send((data,), self.client_addr)
 
     async def _hp_status_loop(self) -> None:
         """Send high-priority status to host on port 1025 at 10 Hz."""
@@ -352,7 +429,7 @@ class Protocol2Server:
         except Exception:
             logger.exception("P2 HP status loop error")
 
-    def _build_hp_status(self) -> bytes:
+    def _build_hp_status(self) -> bytearray:
         """Build high-priority status response (60 bytes).
 
         Layout (Radio -> Host, port 1025):
@@ -363,108 +440,131 @@ class Protocol2Server:
           Bytes 14-15: Forward power (16-bit BE)
           Bytes 22-23: Reverse power (16-bit BE)
         """
-        buf = bytearray(60)
-        seq = self.state.next_seq("hp_status")
-        struct.pack_into(">I", buf, 0, seq)
-        buf[4] = 1 if self.state.ptt else 0  # PTT in bit 0
-
         s = self.state
+        seq = s.next_seq("hp_status")
         if s.ptt and s.tx_drive > 0:
             exc = s.tx_drive * 10
             fwd = (s.tx_drive * s.tx_drive) >> 4
             rev = max(1, fwd // 50)
-            struct.pack_into(">H", buf, 6, exc)
-            struct.pack_into(">H", buf, 14, fwd)
-            struct.pack_into(">H", buf, 22, rev)
+        else:
+            exc = fwd = rev = 0
 
-        return bytes(buf)
+        # Bytes 24-59 are never written; HP status is sent before the next
+        # one is built, so the buffer is reused
+        _HP_STATUS.pack_into(self._hp_buf, 0, seq, s.ptt, exc, fwd, rev)
+        return self._hp_buf
 
-    async def _ddc_iq_loop(self, ddc_index: int) -> None:
-        """Stream DDC IQ data to host from source port 1035+ddc_index."""
-        source_port = PORT_DDC_BASE + ddc_index
-        stream_name = f"ddc_{ddc_index}"
-        logger.info("P2 DDC%d IQ stream from port %d", ddc_index, source_port)
+    async def _ddc_iq_loop(self) -> None:
+        """Stream every DDC's IQ data to host, DDC n from source port 1035+n."""
+        senders = [self._senders[PORT_DDC_BASE + ddc] for ddc in range(self.state.nddc)]
+        for ddc in range(self.state.nddc):
+            logger.info("P2 DDC%d IQ stream from port %d", ddc, PORT_DDC_BASE + ddc)
 
-        try:
-            while self.state.running:
-                pkt = self._build_ddc_iq_packet(ddc_index, stream_name)
-                self._send_to_client(source_port, pkt)
+        def send(bursts: list[list[bytearray]]) -> None:
+            if self.client_addr:
+                for sender, packets in zip(senders, bursts):
+                    sender.send(packets, self.client_addr)
 
-                interval = SAMPLES_PER_DDC_PACKET / self.state.sample_rate
-                await asyncio.sleep(interval)
+        try:
+            await self._streamer.run(
+                self._build_ddc_bursts, send, lambda: self.state.running
+            )
         except asyncio.CancelledError:
             pass
         except Exception:
-            logger.exception("P2 DDC%d IQ loop error", ddc_index)
+            logger.exception("P2 DDC IQ loop error")
+
+    def _build_ddc_bursts(
+        self, bank: int, due: float
+    ) -> tuple[list[list[bytearray]], float]:
+        """Fill DDC_BURST 1444-byte DDC IQ packets for every DDC.
 
-    def _build_ddc_iq_packet(self, ddc_index: int, stream_name: str) -> bytes:
-        """Build 1444-byte DDC IQ packet.
+        Runs on the worker thread, writing into buffer bank `bank`.
+
+        Returns one list of packet buffers per DDC and the seconds of samples
+        they cover. Samples for the whole burst are generated in one call.
 
         Header (16 bytes):
           0-3:   Sequence number (32-bit BE)
-          4-11:  Timestamp (64-bit BE)
+          4-11:  Timestamp (64-bit BE), monotonic µs
           12-13: Bits per sample (16-bit BE) = 24
           14-15: Samples per frame (16-bit BE) = 238
 
         Data (1428 bytes = 238 × 6):
           24-bit I + 24-bit Q per sample
-        """
-        seq = self.state.next_seq(stream_name)
-        timestamp = int(time.time() * 1e6) & 0xFFFFFFFFFFFFFFFF
-
-        header = struct.pack(
-            ">IqHH",
-            seq,
-            timestamp,
-            24,
-            SAMPLES_PER_DDC_PACKET,
-        )
 
+        The constant header fields are written once in _new_ddc_buffer().
+        """
+        s = self.state
+        interval = SAMPLES_PER_DDC_PACKET / s.sample_rate
+        # Timestamp each packet with its scheduled send time (µs)
+        timestamps = [int((due + k * interval) * 1e6) for k in range(DDC_BURST)]
+        n_samples = DDC_BURST * SAMPLES_PER_DDC_PACKET
         if self.echo is not None:
-            iq = self.echo.generate_echo(
-                SAMPLES_PER_DDC_PACKET,
-                self.state.rx_frequencies[ddc_index],
-                self.state.sample_rate,
-            )
+            iq = [
+                self.echo.generate_echo(n_samples, s.rx_frequencies[ddc], s.sample_rate)
+                for ddc in range(s.nddc)
+            ]
         else:
-            iq = self.siggen.generate_iq(SAMPLES_PER_DDC_PACKET, ddc_index)
-        data = pack_iq_24bit_fast(iq)
-
-        return header + data
+            iq = self.siggen.generate_iq_batch(n_samples, s.nddc)
+
+        bursts = []
+        for ddc in range(s.nddc):
+            next_seq = self._ddc_seqs[ddc]
+            packets = self._ddc_bufs[bank][ddc]
+            for k, buf in enumerate(packets):
+                _DDC_SEQ_TS.pack_into(buf, 0, next_seq(), timestamps[k])
+                start = k * SAMPLES_PER_DDC_PACKET
+                pack_iq_24bit_fast(
+                    iq[ddc][start : start + SAMPLES_PER_DDC_PACKET],
+                    out=memoryview(buf)[DDC_HEADER_SIZE:],
+                )
+            bursts.append(packets)
+        return bursts, DDC_BURST * interval
+
+    @staticmethod
+    def _new_ddc_buffer() -> bytearray:
+        buf = bytearray(DDC_PACKET_SIZE)
+        struct.pack_into(">HH", buf, 12, 24, SAMPLES_PER_DDC_PACKET)
+        return buf
 
     async def _mic_loop(self) -> None:
         """Stream mic silence to host on port 1026."""
+        interval = SAMPLES_PER_MIC_PACKET / 48000  # mic always 48 kHz
         try:
+            deadline = Deadline()
             while self.state.running:
                 pkt = self._build_mic_packet()
                 self._send_to_client(PORT_MIC, pkt)
-
-                interval = SAMPLES_PER_MIC_PACKET / 48000  # mic always 48 kHz
-                await asyncio.sleep(interval)
+                await asyncio.sleep(deadline.advance(interval))
         except asyncio.CancelledError:
             pass
         except Exception:
             logger.exception("P2 Mic loop error")
 
-    def _build_mic_packet(self) -> bytes:
+    def _build_mic_packet(self) -> bytearray:
         """Build mic data packet (silence).
 
         4-byte seq header + 128 bytes (64 samples × 2 bytes) = 132 bytes.
+        The payload stays zero, so one buffer is reused and only the sequence
+        number is rewritten; mic packets are sent before the next is built.
         """
-        seq = self.state.next_seq("mic")
-        header = struct.pack(">I", seq)
-        data = b"\x00" * (SAMPLES_PER_MIC_PACKET * 2)
-        return header + data
+        _U32.pack_into(self._mic_buf, 0, self._next_mic_seq())
+        return self._mic_buf
 
     def close(self) -> None:
         self._stop_streaming()
+        for sender in self._senders.values():
+            sender.close()
+        self._streamer.close()
+        loop = asyncio.get_running_loop()
         for handler in self._handlers.values():
-            if handler.transport:
-                handler.transport.close()
+            loop.remove_reader(handler.sock.fileno())
+            handler.sock.close()
         # Close DDC send sockets (1035+); 1025/1026 are shared with handlers
-        for sport, transport in self._send_sockets.items():
+        for sport, sock in self._send_sockets.items():
             if sport >= PORT_DDC_BASE:
-                transport.close()
+                sock.close()
 
 
 async def run_protocol2(
@@ -473,6 +573,7 @@ async def run_protocol2(
     echo: EchoBuffer | None = None,
 ) -> None:
     """Start Protocol 2 server."""
+    warm_up_iq_kernels()
     server = Protocol2Server(state, siggen, echo)
     await server.start()
 
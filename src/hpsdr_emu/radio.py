@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import enum
+import functools
 import logging
 import os
-import struct
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 import numpy as np
@@ -41,6 +43,9 @@ class HPSDRHW(enum.Enum):
 # Map CLI names to enum members
 RADIO_CHOICES: dict[str, HPSDRHW] = {m.name.lower(): m for m in HPSDRHW}
 
+# Full-scale value of a 24-bit signed I/Q sample
+IQ_24BIT_MAX = 8388607  # 2^23 - 1
+
 # Sample rates and their Protocol 1 encoding
 SAMPLE_RATES_P1 = {48000: 0, 96000: 1, 192000: 2, 384000: 3}
 
@@ -65,14 +70,33 @@ class RadioState:
     running: bool = False
     ptt: bool = False
 
-    # Sequence counters keyed by stream name
-    seq: dict[str, int] = field(default_factory=dict)
+    # Sequence counters keyed by stream name; each one-element list holds
+    # the stream's next value
+    seq: dict[str, list[int]] = field(default_factory=dict)
 
     def next_seq(self, stream: str) -> int:
-        val = self.seq.get(stream, 0)
-        self.seq[stream] = (val + 1) & 0xFFFFFFFF
+        cell = self.seq.get(stream)
+        if cell is None:
+            cell = self.seq[stream] = [0]
+        val = cell[0]
+        cell[0] = (val + 1) & 0xFFFFFFFF
         return val
 
+    def seq_counter(self, stream: str) -> Callable[[], int]:
+        """Return a function yielding the stream's next sequence number.
+
+        Shares its count with next_seq(); per-packet callers hold on to it
+        to skip the dict lookups.
+        """
+        cell = self.seq.setdefault(stream, [0])
+
+        def next_value() -> int:
+            val = cell[0]
+            cell[0] = (val + 1) & 0xFFFFFFFF
+            return val
+
+        return next_value
+
     @staticmethod
     def random_mac() -> bytes:
         b = os.urandom(6)
@@ -89,35 +113,88 @@ class SignalGenerator:
         tone_offset_hz: float = 1000.0,
         noise_level: float = 3e-6,
         amplitude: float = 0.3,
+        dtype: type[np.complexfloating] = np.complex64,
     ):
         self.sample_rate = sample_rate
         self.tone_offset_hz = tone_offset_hz
         self.noise_level = noise_level
         self.amplitude = amplitude
-        self._phase: dict[int, float] = {}  # per-DDC phase accumulator
+        # Output precision; samples end up as 24-bit ints, so single is plenty
+        self.dtype = np.dtype(dtype)
+        self._rng = np.random.default_rng(np.random.SFC64())
+        # Per-DDC unit phasor of the tone's next sample (DDS phase state)
+        self._phasor: dict[int, complex] = {}
+        # (n_samples, sample_rate, tone_offset_hz) -> (tone block, block step)
+        self._tone_blocks: dict[tuple[int, int, float], tuple[np.ndarray, complex]] = {}
 
     def generate_iq(self, n_samples: int, ddc_index: int = 0) -> np.ndarray:
         """Generate complex I/Q samples for one DDC.
 
-        Returns array of complex128 with values in [-1, 1].
+        Returns array of self.dtype with values in [-1, 1].
         """
-        phase = self._phase.get(ddc_index, 0.0)
-        t = (np.arange(n_samples) / self.sample_rate) + phase
+        block, step = self._tone_block(n_samples)
+        phasor = self._phasor.get(ddc_index, 1.0 + 0j)
+
+        iq = self._noise(n_samples, self.noise_level)
+        iq += (self.amplitude * phasor) * block
+
+        self._phasor[ddc_index] = self._advance_phasor(phasor, step)
+        return iq
+
+    def generate_iq_batch(self, n_samples: int, nddc: int) -> np.ndarray:
+        """Generate complex I/Q samples for DDCs 0..nddc-1 in one pass.
 
-        tone = self.amplitude * np.exp(2j * np.pi * self.tone_offset_hz * t)
-        noise = self.noise_level * (
-            np.random.randn(n_samples) + 1j * np.random.randn(n_samples)
+        Returns self.dtype array of shape (nddc, n_samples); row d continues
+        the phase of generate_iq(..., ddc_index=d).
+        """
+        block, step = self._tone_block(n_samples)
+        phasors = np.array(
+            [self._phasor.get(d, 1.0 + 0j) for d in range(nddc)], dtype=self.dtype
         )
-        iq = tone + noise
 
-        self._phase[ddc_index] = phase + n_samples / self.sample_rate
-        if self._phase[ddc_index] > 1e6:
-            self._phase[ddc_index] %= (
-                (1.0 / self.tone_offset_hz) if self.tone_offset_hz else 0.0
-            )
+        iq = self._noise(n_samples, self.noise_level, nddc).reshape(nddc, n_samples)
+        iq += (self.amplitude * phasors[:, None]) * block
 
+        for d in range(nddc):
+            self._phasor[d] = self._advance_phasor(complex(phasors[d]), step)
         return iq
 
+    def _noise(self, n_samples: int, level: float, rows: int = 1) -> np.ndarray:
+        """Complex Gaussian noise, rows * n_samples samples, from one draw."""
+        real_dtype = np.finfo(self.dtype).dtype
+        noise = self._rng.standard_normal(2 * rows * n_samples, dtype=real_dtype)
+        noise = noise.view(self.dtype)
+        noise *= level
+        return noise
+
+    def _tone_block(self, n_samples: int) -> tuple[np.ndarray, complex]:
+        """Return (unit tone from phase 0, phasor step) for an n_samples block.
+
+        Computed once per block size, sample rate and tone offset.
+        """
+        key = (n_samples, self.sample_rate, self.tone_offset_hz)
+        cached = self._tone_blocks.get(key)
+        if cached is None:
+            w = 2.0 * np.pi * self.tone_offset_hz / self.sample_rate
+            step = complex(np.exp(1j * w * n_samples))
+            block = np.exp(1j * w * np.arange(n_samples)).astype(self.dtype)
+            cached = (block, step)
+            self._tone_blocks[key] = cached
+        return cached
+
+    @staticmethod
+    def _advance_phasor(phasor: complex, step: complex) -> complex:
+        phasor *= step
+        # Renormalize so rounding error can't make the amplitude drift
+        return phasor / abs(phasor)
+
+    def generate_iq_int24(self, n_samples: int, ddc_index: int = 0) -> np.ndarray:
+        """Generate I/Q samples for one DDC, pre-scaled for 24-bit packing.
+
+        Returns int32 array of shape (n_samples, 2); see scale_iq_24bit().
+        """
+        return scale_iq_24bit(self.generate_iq(n_samples, ddc_index))
+
     def generate_iq_fft(
         self,
         n_samples: int,
@@ -126,7 +203,9 @@ class SignalGenerator:
         phases: list[float] | None = None,
         noise_level: float | None = None,
     ) -> np.ndarray:
-        """Generate I/Q signal using FFT/IFFT from spectral components.
+        """Generate I/Q signal from spectral components on FFT bins.
+
+        Uses an IRFFT for many components and a direct cosine sum for a few.
 
         Args:
             n_samples: Number of samples to generate
@@ -136,7 +215,8 @@ class SignalGenerator:
             noise_level: Optional noise level, defaults to self.noise_level
 
         Returns:
-            Complex I/Q array with values in [-1, 1]
+            Complex I/Q array (real-valued tones); each component peaks at
+            its own amplitude, so keep their sum within 1 to stay in [-1, 1]
         """
         if len(frequencies) != len(amplitudes):
             raise ValueError("frequencies and amplitudes must have same length")
@@ -148,29 +228,42 @@ class SignalGenerator:
 
         noise_level = noise_level if noise_level is not None else self.noise_level
 
-        spectrum = np.zeros(n_samples, dtype=np.complex128)
-
-        for freq, amp, phase in zip(frequencies, amplitudes, phases):
-            bin_idx = int(round(freq * n_samples / self.sample_rate))
-            if 0 <= bin_idx < n_samples // 2 + 1:
-                spectrum[bin_idx] = amp * np.exp(1j * phase)
-                if bin_idx > 0 and bin_idx < n_samples // 2:
-                    spectrum[n_samples - bin_idx] = amp * np.exp(-1j * phase)
-
-        iq = np.fft.irfft(spectrum, n=n_samples)
-
-        iq_complex = iq + 1j * np.zeros(n_samples)
-        max_val = np.max(np.abs(iq_complex))
-        if max_val > 0:
-            iq_complex = iq_complex / max_val * np.max(amplitudes)
+        # Tones sit on FFT bins; bins beyond Nyquist are dropped
+        n_bins = n_samples // 2 + 1
+        bins = np.rint(
+            np.asarray(frequencies, dtype=np.float64) * n_samples / self.sample_rate
+        ).astype(np.int64)
+        keep = (bins >= 0) & (bins < n_bins)
+        bins = bins[keep]
+        amps = np.asarray(amplitudes, dtype=np.float64)[keep]
+        phases = np.asarray(phases, dtype=np.float64)[keep]
+
+        if len(bins) < 0.25 * np.log2(max(n_samples, 2)):
+            # A few tones: summing the cosines directly beats an N-point IRFFT.
+            # Phase indices are reduced mod n exactly, so the angles stay
+            # within one turn and single precision is enough for cos.
+            real_dtype = np.finfo(self.dtype).dtype
+            turns = np.multiply.outer(bins, _sample_index(n_samples))
+            turns %= n_samples
+            angles = turns.astype(real_dtype)
+            angles *= 2.0 * np.pi / n_samples
+            angles += phases.astype(real_dtype)[:, None]
+            iq = amps.astype(real_dtype) @ np.cos(angles, out=angles)
+        else:
+            # irfft scales by 1/n and folds in each interior bin's mirror image
+            weight = np.where((bins == 0) | (2 * bins == n_samples), 1.0, 0.5)
+            spectrum = np.zeros(n_bins, dtype=self.dtype)
+            np.add.at(spectrum, bins, n_samples * weight * amps * np.exp(1j * phases))
+            iq = _load_irfft()(spectrum, n=n_samples)
 
         if noise_level > 0:
-            noise = noise_level * (
-                np.random.randn(n_samples) + 1j * np.random.randn(n_samples)
-            )
-            iq_complex = iq_complex + noise
+            # Add the real signal into the noise draw's I channel rather than
+            # converting it to a complex array first
+            iq_complex = self._noise(n_samples, noise_level)
+            iq_complex.real += iq
+            return iq_complex
 
-        return iq_complex
+        return iq.astype(self.dtype)
 
     def generate_multi_tone(
         self,
@@ -196,39 +289,102 @@ class SignalGenerator:
         )
 
 
+@functools.lru_cache(maxsize=8)
+def _sample_index(n_samples: int) -> np.ndarray:
+    """Read-only np.arange(n_samples), shared across calls of the same size."""
+    index = np.arange(n_samples)
+    index.flags.writeable = False
+    return index
+
+
+# SciPy and Numba are optional and slow to import, so the loaders below import
+# them on first use rather than at module scope.
+
+
+@functools.cache
+def _load_irfft():
+    """Return scipy.fft.irfft (pocketfft, plan cache), or numpy's without SciPy."""
+    try:
+        from scipy import fft
+    except ImportError:
+        return np.fft.irfft
+    return functools.partial(fft.irfft, workers=-1, overwrite_x=True)
+
+
+@functools.cache
+def numba_kernel(py_func: Callable) -> Callable | None:
+    """Return ``py_func`` compiled by Numba, or None without Numba.
+
+    Compilation happens on the kernel's first call; see warm_up_kernel().
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True, boundscheck=False)(py_func)
+
+
+def warm_up_kernel(py_func: Callable, *args) -> None:
+    """Compile ``py_func``'s kernel for the types of ``args`` ahead of use.
+
+    Servers call this before streaming so the first packet isn't delayed by
+    compilation. Does nothing without Numba.
+    """
+    kernel = numba_kernel(py_func)
+    if kernel is not None:
+        kernel(*args)
+
+
+def scale_iq_24bit(iq: np.ndarray) -> np.ndarray:
+    """Clip complex I/Q to [-1, 1] and scale to 24-bit signed integers.
+
+    Returns int32 array of shape (n, 2) holding [I, Q] per sample.
+    """
+    return _scale_iq_24bit_float(iq).astype(np.int32)
+
+
+def _scale_iq_24bit_float(iq: np.ndarray) -> np.ndarray:
+    """Scale I/Q to (n, 2) [I, Q] floats, saturated to the 24-bit range."""
+    scaled = np.empty((len(iq), 2), dtype=iq.real.dtype)
+    np.multiply(iq.real, IQ_24BIT_MAX, out=scaled[:, 0])
+    np.multiply(iq.imag, IQ_24BIT_MAX, out=scaled[:, 1])
+    # Saturating after scaling gives the same values as clipping to [-1, 1]
+    # first, in one in-place pass instead of a temporary per component
+    np.clip(scaled, -IQ_24BIT_MAX, IQ_24BIT_MAX, out=scaled)
+    return scaled
+
+
 def pack_iq_24bit(iq: np.ndarray) -> bytes:
-    """Pack complex I/Q array into 24-bit big-endian bytes (3B I + 3B Q per sample)."""
-    max_val = 8388607  # 2^23 - 1
-    parts = []
-    for sample in iq:
-        i_val = int(np.clip(sample.real, -1.0, 1.0) * max_val)
-        q_val = int(np.clip(sample.imag, -1.0, 1.0) * max_val)
-        # Sign-extend to 24-bit and pack as 3 bytes big-endian
-        parts.append(struct.pack(">i", i_val)[1:4])
-        parts.append(struct.pack(">i", q_val)[1:4])
-    return b"".join(parts)
-
-
-def pack_iq_24bit_fast(iq: np.ndarray) -> bytes:
-    """Vectorized version of pack_iq_24bit for better performance."""
-    max_val = 8388607
-    i_vals = np.clip(iq.real, -1.0, 1.0) * max_val
-    q_vals = np.clip(iq.imag, -1.0, 1.0) * max_val
-    i_ints = i_vals.astype(np.int32)
-    q_ints = q_vals.astype(np.int32)
-
-    result = bytearray(len(iq) * 6)
-    for idx in range(len(iq)):
-        iv = i_ints[idx] & 0xFFFFFF
-        qv = q_ints[idx] & 0xFFFFFF
-        off = idx * 6
-        result[off] = (iv >> 16) & 0xFF
-        result[off + 1] = (iv >> 8) & 0xFF
-        result[off + 2] = iv & 0xFF
-        result[off + 3] = (qv >> 16) & 0xFF
-        result[off + 4] = (qv >> 8) & 0xFF
-        result[off + 5] = qv & 0xFF
-    return bytes(result)
+    """Pack complex I/Q array into 24-bit big-endian bytes (3B I + 3B Q per sample).
+
+    Same output as pack_iq_24bit_fast(), which does the work.
+    """
+    return bytes(pack_iq_24bit_fast(iq))
+
+
+def pack_iq_24bit_fast(
+    iq: np.ndarray, out: bytearray | memoryview | None = None
+) -> bytearray | memoryview:
+    """Vectorized version of pack_iq_24bit for better performance.
+
+    Returns a memoryview of a new buffer rather than bytes, saving a copy;
+    sockets and bytearray slices accept it as is. If ``out`` is given, the
+    samples are written into it and ``out`` is returned instead; it must be
+    writable and at least 6 * len(iq) bytes long.
+    """
+    n = len(iq)
+    if out is None:
+        dest = np.empty(n * 6, dtype=np.uint8)
+    else:
+        dest = np.frombuffer(out, dtype=np.uint8, count=n * 6)
+    kernel = numba_kernel(_pack_iq_24be)
+    if kernel is not None:
+        kernel(scale_iq_24bit(iq), dest)
+    else:
+        # Big-endian int32 words; the low three bytes of each are the 24-bit value
+        words = _scale_iq_24bit_float(iq).astype(">i4")
+        dest.reshape(n, 2, 3)[:] = words.view(np.uint8).reshape(n, 2, 4)[:, :, 1:]
+    return memoryview(dest) if out is None else out
 
 
 def pack_silence_16bit(n_samples: int) -> bytes:
@@ -240,54 +396,81 @@ def unpack_tx_iq_16bit(data: bytes) -> np.ndarray:
     """Unpack Protocol 1 TX IQ from host sub-frame data.
 
     Each 8-byte block is [L(2B) R(2B) I(2B) Q(2B)], all big-endian signed.
-    We extract I and Q (bytes 4-7 of each block).
+    We extract I and Q (bytes 4-7 of each block). Returns complex64.
     """
     n_blocks = len(data) // 8
-    if n_blocks == 0:
-        return np.empty(0, dtype=np.complex128)
-    samples = np.empty(n_blocks, dtype=np.complex128)
-    for k in range(n_blocks):
-        off = k * 8
-        i_val = struct.unpack_from(">h", data, off + 4)[0]
-        q_val = struct.unpack_from(">h", data, off + 6)[0]
-        samples[k] = (i_val + 1j * q_val) / 32768.0
-    return samples
+    raw = np.frombuffer(data, dtype=">i2", count=n_blocks * 4).reshape(-1, 4)
+    iq = raw[:, 2:4].astype(np.float32)  # contiguous (n, 2) [I, Q]
+    iq *= 1.0 / 32768.0
+    return iq.view(np.complex64).ravel()
 
 
 def unpack_tx_audio_16bit(data: bytes) -> np.ndarray:
     """Unpack Protocol 2 TX audio (16-bit L + 16-bit R per sample, big-endian).
 
-    Treats L as real, R as imaginary to form complex IQ.
+    Treats L as real, R as imaginary to form complex IQ. Returns complex64.
     """
     n_samples = len(data) // 4
-    if n_samples == 0:
-        return np.empty(0, dtype=np.complex128)
-    samples = np.empty(n_samples, dtype=np.complex128)
-    for k in range(n_samples):
-        off = k * 4
-        l_val = struct.unpack_from(">h", data, off)[0]
-        r_val = struct.unpack_from(">h", data, off + 2)[0]
-        samples[k] = (l_val + 1j * r_val) / 32768.0
-    return samples
+    raw = np.frombuffer(data, dtype=">i2", count=n_samples * 2).reshape(-1, 2)
+    lr = raw.astype(np.float32)  # contiguous (n, 2) [L, R], copied out of data
+    lr *= 1.0 / 32768.0
+    return lr.view(np.complex64).ravel()
 
 
 def unpack_tx_iq_24bit(data: bytes) -> np.ndarray:
-    """Unpack Protocol 2 TX IQ (24-bit I + 24-bit Q per sample, big-endian)."""
+    """Unpack Protocol 2 TX IQ (24-bit I + 24-bit Q per sample, big-endian).
+
+    Returns complex64.
+    """
     n_samples = len(data) // 6
-    if n_samples == 0:
-        return np.empty(0, dtype=np.complex128)
-    samples = np.empty(n_samples, dtype=np.complex128)
-    for k in range(n_samples):
-        off = k * 6
-        # 24-bit signed big-endian
-        ib = data[off] << 16 | data[off + 1] << 8 | data[off + 2]
-        if ib & 0x800000:
-            ib -= 0x1000000
-        qb = data[off + 3] << 16 | data[off + 4] << 8 | data[off + 5]
-        if qb & 0x800000:
-            qb -= 0x1000000
-        samples[k] = (ib + 1j * qb) / 8388607.0
-    return samples
+    raw = np.frombuffer(data, dtype=np.uint8, count=n_samples * 6)
+    kernel = numba_kernel(_unpack_iq_24be)
+    if kernel is not None:
+        iq = np.empty((n_samples, 2), dtype=np.float32)
+        kernel(raw, iq)
+        return iq.view(np.complex64).ravel()
+
+    # Each 24-bit value becomes the top three bytes of a big-endian int32,
+    # so an arithmetic right shift by 8 sign-extends it without branching
+    padded = np.zeros((n_samples, 2, 4), dtype=np.uint8)
+    padded[:, :, :3] = raw.reshape(-1, 2, 3)
+    words = padded.view(">i4")[:, :, 0] >> 8
+    iq = np.divide(words, 8388607.0, dtype=np.float32)  # contiguous (n, 2) [I, Q]
+    return iq.view(np.complex64).ravel()
+
+
+def _pack_iq_24be(ints, out):
+    """Scalar form of pack_iq_24bit_fast over (n, 2) int24 I/Q, compiled by Numba."""
+    pos = 0
+    for k in range(ints.shape[0]):
+        iv = ints[k, 0]
+        qv = ints[k, 1]
+        out[pos] = (iv >> 16) & 0xFF
+        out[pos + 1] = (iv >> 8) & 0xFF
+        out[pos + 2] = iv & 0xFF
+        out[pos + 3] = (qv >> 16) & 0xFF
+        out[pos + 4] = (qv >> 8) & 0xFF
+        out[pos + 5] = qv & 0xFF
+        pos += 6
+
+
+def _unpack_iq_24be(raw, out):
+    """Scalar form of unpack_tx_iq_24bit into (n, 2) float32, compiled by Numba."""
+    pos = 0
+    for k in range(out.shape[0]):
+        for c in range(2):
+            v = np.int32(raw[pos]) << 16 | np.int32(raw[pos + 1]) << 8 | raw[pos + 2]
+            v = (v ^ 0x800000) - 0x800000  # branchless sign extension
+            out[k, c] = np.float32(v) / np.float32(8388607.0)
+            pos += 3
+
+
+def warm_up_iq_kernels() -> None:
+    """Warm up the P2 I/Q pack and unpack kernels."""
+    warm_up_kernel(_pack_iq_24be, np.zeros((1, 2), np.int32), np.zeros(6, np.uint8))
+    warm_up_kernel(
+        _unpack_iq_24be, np.frombuffer(bytes(6), np.uint8), np.zeros((1, 2), np.float32)
+    )
 
 
 class EchoBuffer:
@@ -295,22 +478,48 @@ class EchoBuffer:
 
     ATTENUATION_DB = 80.0  # echo playback attenuation
     ATTENUATION = 10 ** (-ATTENUATION_DB / 20.0)  # ~0.0001
+    # Each loop is stored with its first WRAP_MIRROR samples appended, so any
+    # read up to that length is one contiguous slice even across the wrap.
+    WRAP_MIRROR = 4096
+    # Cached shift ramps are dropped wholesale past this many (retune sweeps)
+    MAX_SHIFT_RAMPS = 64
 
-    def __init__(self, sample_rate: int = 48000, max_duration: float = 10.0):
+    def __init__(
+        self,
+        sample_rate: int = 48000,
+        max_duration: float = 10.0,
+        max_block: int = 8192,
+    ):
         self.sample_rate = sample_rate
         self.max_duration = max_duration
-        self._echoes: dict[int, np.ndarray] = {}  # freq -> looping IQ
-        self._recording: list[np.ndarray] = []
+        # Echo k (structure of arrays): TX frequency, looping complex64 IQ +
+        # mirror, loop length (sans mirror), read position and the unit
+        # phasor of its shift oscillator (DDS phase state)
+        self._echo_freqs: list[int] = []
+        self._echo_bufs: list[np.ndarray] = []
+        self._echo_lens: list[int] = []
+        self._echo_pos: list[int] = []
+        self._shift_phasors: list[complex] = []
+        # Recording is copied straight into one buffer of max_duration;
+        # samples past the end are dropped
+        self._rec_buf = np.empty(int(sample_rate * max_duration), dtype=np.complex64)
+        self._rec_pos = 0
         self._recording_freq: int = 0
         self._is_recording: bool = False
-        self._playback_pos: dict[int, int] = {}  # per-freq read position
-        self._shift_phase: dict[int, float] = {}  # per-freq angle accumulator (radians)
+        # (echo offsets, sample_rate, n_samples) -> (oscillator ramps, block steps)
+        self._shift_ramps: dict[
+            tuple[tuple[int, ...], int, int], tuple[np.ndarray, list[complex]]
+        ] = {}
+        # Packets may be built on a worker thread while TX commits on the loop
+        self._lock = threading.Lock()
+        # Per-call work buffer (room for 4 echoes of max_block), grown on demand
+        self._scratch = np.empty(4 * max_block, dtype=np.complex64)
 
     def start_recording(self, tx_freq: int) -> None:
         """Begin recording TX IQ at the given frequency."""
         if self._is_recording:
             self._commit()
-        self._recording = []
+        self._rec_pos = 0
         self._recording_freq = tx_freq
         self._is_recording = True
         logger.info("Echo: recording started on %d Hz", tx_freq)
@@ -319,7 +528,9 @@ class EchoBuffer:
         """Append TX IQ samples during active recording."""
         if not self._is_recording or len(samples) == 0:
             return
-        self._recording.append(samples.copy())
+        n = min(len(samples), len(self._rec_buf) - self._rec_pos)
+        self._rec_buf[self._rec_pos : self._rec_pos + n] = samples[:n]
+        self._rec_pos += n
 
     def stop_recording(self) -> None:
         """Stop recording and commit to echo loop."""
@@ -328,29 +539,38 @@ class EchoBuffer:
             self._is_recording = False
 
     def _commit(self) -> None:
-        """Commit current recording to the echo dictionary."""
-        if not self._recording:
+        """Commit current recording as the echo loop for its frequency."""
+        n = self._rec_pos
+        if n == 0:
             return
+        self._rec_pos = 0
         freq = self._recording_freq
         if freq == 0:
             logger.debug("Echo: discarding recording with freq=0")
-            self._recording = []
             return
-        buf = np.concatenate(self._recording)
-        max_samples = int(self.sample_rate * self.max_duration)
-        if len(buf) > max_samples:
-            buf = buf[:max_samples]
-        if len(buf) == 0:
-            return
-        self._echoes[freq] = buf
-        self._playback_pos[freq] = 0
+        # The recording buffer is reused, so the loop gets its own copy
+        mirror = min(n, self.WRAP_MIRROR)
+        looped = np.empty(n + mirror, dtype=np.complex64)
+        looped[:n] = self._rec_buf[:n]
+        looped[n:] = self._rec_buf[:mirror]
+        with self._lock:
+            if freq in self._echo_freqs:
+                k = self._echo_freqs.index(freq)
+                self._echo_bufs[k] = looped
+                self._echo_lens[k] = n
+                self._echo_pos[k] = 0
+            else:
+                self._echo_freqs.append(freq)
+                self._echo_bufs.append(looped)
+                self._echo_lens.append(n)
+                self._echo_pos.append(0)
+                self._shift_phasors.append(1.0 + 0j)
         logger.info(
             "Echo: committed %d samples (%.2fs) on %d Hz",
-            len(buf),
-            len(buf) / self.sample_rate,
+            n,
+            n / self.sample_rate,
             freq,
         )
-        self._recording = []
 
     def generate_echo(
         self, n_samples: int, rx_freq: int, sample_rate: int
@@ -360,46 +580,97 @@ class EchoBuffer:
         Iterates all stored echoes, reads looping samples, frequency-shifts
         by (echo_freq - rx_freq), and sums. Skips echoes outside DDC bandwidth.
         """
-        if not self._echoes:
-            return np.zeros(n_samples, dtype=np.complex128)
+        if not self._echo_bufs:
+            return np.zeros(n_samples, dtype=np.complex64)
+        with self._lock:
+            return self._mix_echoes(n_samples, rx_freq, sample_rate)
 
-        result = np.zeros(n_samples, dtype=np.complex128)
+    def _mix_echoes(self, n_samples: int, rx_freq: int, sample_rate: int) -> np.ndarray:
         half_bw = sample_rate / 2.0
-
-        for freq, echo_buf in self._echoes.items():
-            offset_hz = rx_freq - freq
-            if abs(offset_hz) > half_bw:
-                continue
-
-            # Read looping samples
-            pos = self._playback_pos.get(freq, 0)
-            echo_len = len(echo_buf)
-            chunk = np.empty(n_samples, dtype=np.complex128)
-            remaining = n_samples
-            write_pos = 0
-            while remaining > 0:
-                available = min(remaining, echo_len - pos)
-                chunk[write_pos : write_pos + available] = echo_buf[
-                    pos : pos + available
-                ]
-                pos = (pos + available) % echo_len
-                write_pos += available
-                remaining -= available
-            self._playback_pos[freq] = pos
-
-            # Frequency-shift if echo is not at DDC center.
-            # Track accumulated angle (radians) so the shift oscillator
-            # transitions smoothly when offset_hz changes due to retuning.
-            if offset_hz != 0:
-                phase0 = self._shift_phase.get(freq, 0.0)
-                step = 2.0 * np.pi * offset_hz / sample_rate
-                angles = phase0 + step * np.arange(n_samples)
-                chunk = chunk * np.exp(1j * angles)
-                new_phase = phase0 + step * n_samples
-                if abs(new_phase) > 1e6:
-                    new_phase %= 2.0 * np.pi
-                self._shift_phase[freq] = new_phase
-
-            result += chunk
-
-        return result * self.ATTENUATION
+        active = [
+            k
+            for k, freq in enumerate(self._echo_freqs)
+            if abs(rx_freq - freq) <= half_bw
+        ]
+        if not active:
+            return np.zeros(n_samples, dtype=np.complex64)
+        offsets = tuple(rx_freq - self._echo_freqs[k] for k in active)
+
+        # Track the oscillator phasor per echo so the shift transitions
+        # smoothly when offset_hz changes due to retuning; echoes already at
+        # the DDC center are not rotated
+        ramps, steps = self._shift_ramps_for(offsets, sample_rate, n_samples)
+        phasors = []
+        for k, offset, step in zip(active, offsets, steps):
+            if offset:
+                phasor = self._shift_phasors[k]
+                advanced = phasor * step
+                self._shift_phasors[k] = advanced / abs(advanced)
+            else:
+                phasor = 1.0 + 0j
+            phasors.append(phasor)
+
+        # One contiguous row of looped samples per active echo
+        size = len(active) * n_samples
+        if size > len(self._scratch):
+            self._scratch = np.empty(size, dtype=np.complex64)
+        chunks = self._scratch[:size].reshape(len(active), n_samples)
+
+        # Results are new arrays: callers keep them while later calls reuse
+        # the scratch
+        if len(active) == 1:
+            # Nothing to stack: shift the loop samples directly
+            result = np.multiply(self._read_loop(active[0], chunks[0]), ramps[0])
+            result *= phasors[0]
+            return result
+        for k, row in zip(active, chunks):
+            samples = self._read_loop(k, row)
+            if samples is not row:
+                row[:] = samples
+        # Shift and attenuate every echo with one multiply, then apply the
+        # phasors and sum over echoes as one matrix-vector product
+        np.multiply(chunks, ramps, out=chunks)
+        return np.array(phasors, dtype=np.complex64) @ chunks
+
+    def _read_loop(self, k: int, out: np.ndarray) -> np.ndarray:
+        """Return the next len(out) looping samples of echo k.
+
+        A view of the loop when the mirrored tail covers the wrap, otherwise
+        the samples are copied into out and out is returned.
+        """
+        echo_buf = self._echo_bufs[k]
+        echo_len = self._echo_lens[k]
+        n_samples = len(out)
+        pos = self._echo_pos[k]
+        self._echo_pos[k] = (pos + n_samples) % echo_len
+        if n_samples <= len(echo_buf) - echo_len:
+            return echo_buf[pos : pos + n_samples]
+        write_pos = 0
+        while write_pos < n_samples:
+            available = min(n_samples - write_pos, echo_len - pos)
+            out[write_pos : write_pos + available] = echo_buf[pos : pos + available]
+            pos = (pos + available) % echo_len
+            write_pos += available
+        return out
+
+    def _shift_ramps_for(
+        self, offsets: tuple[int, ...], sample_rate: int, n_samples: int
+    ) -> tuple[np.ndarray, list[complex]]:
+        """Return (attenuated oscillators from phase 0, phasor steps), one per offset."""
+        key = (offsets, sample_rate, n_samples)
+        cached = self._shift_ramps.get(key)
+        if cached is None:
+            if len(self._shift_ramps) >= self.MAX_SHIFT_RAMPS:
+                self._shift_ramps.clear()
+            w = 2.0 * np.pi * np.array(offsets, dtype=np.float64) / sample_rate
+            steps = np.exp(1j * w * n_samples)
+            ramps = np.exp(1j * w[:, None] * np.arange(n_samples)) * self.ATTENUATION
+            cached = (ramps.astype(np.complex64), steps.tolist())
+            self._shift_ramps[key] = cached
+        return cached
+
+    def generate_echo_int24(
+        self, n_samples: int, rx_freq: int, sample_rate: int
+    ) -> np.ndarray:
+        """Like generate_echo(), pre-scaled for 24-bit packing (see scale_iq_24bit)."""
+        return scale_iq_24bit(self.generate_echo(n_samples, rx_freq, sample_rate))
@@ -0,0 +1,79 @@
+"""Pacing shared by the Protocol 1 and Protocol 2 stream loops.
+
+Streams are paced against an absolute monotonic deadline, so build/send time
+and wakeup jitter don't accumulate as drift. Packet bursts are built on a
+worker thread into one of two buffer banks while the event loop sends the
+other.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# How far (s) a stream may fall behind schedule and still catch up by sending
+# back to back; beyond this it resyncs to now
+MAX_STREAM_LAG = 0.05
+
+
+class Deadline:
+    """Absolute monotonic send schedule of one stream."""
+
+    def __init__(self) -> None:
+        self.due = time.monotonic()
+
+    def advance(self, seconds: float) -> float:
+        """Move the deadline on by ``seconds`` and return the delay until it.
+
+        A stream more than MAX_STREAM_LAG behind (stalled loop) resyncs to
+        now instead of bursting to catch up.
+        """
+        self.due += seconds
+        delay = self.due - time.monotonic()
+        if delay < -MAX_STREAM_LAG:
+            self.due = time.monotonic()
+            return 0.0
+        return max(0.0, delay)
+
+
+class BurstStreamer:
+    """Sends packet bursts built on a worker thread, paced by a Deadline."""
+
+    def __init__(self, name: str) -> None:
+        # Single worker so builds stay sequential (sequence numbers, phase)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    async def run(
+        self,
+        build: Callable[[int, float], tuple[Any, float]],
+        send: Callable[[Any], None],
+        running: Callable[[], bool],
+    ) -> None:
+        """Stream until ``running()`` is false.
+
+        ``build(bank, due)`` runs on the worker: it fills buffer bank ``bank``
+        (0 or 1) with the burst due at monotonic time ``due`` and returns the
+        burst with the seconds of samples it covers. ``send(burst)`` runs on
+        the event loop while the next burst is built into the other bank.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = Deadline()
+        bank = 0
+        pending = loop.run_in_executor(self._executor, build, bank, deadline.due)
+        try:
+            while running():
+                burst, duration = await pending
+                bank ^= 1
+                pending = loop.run_in_executor(
+                    self._executor, build, bank, deadline.due + duration
+                )
+                send(burst)
+                await asyncio.sleep(deadline.advance(duration))
+        finally:
+            pending.cancel()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,207 @@
+"""UDP socket helpers for the HPSDR emulator: buffer sizing and batched send.
+
+Servers bind plain non-blocking sockets, read them with ``loop.add_reader()``
+and stream by writing straight to the same socket, so packets leave from its
+bound source port, which clients rely on for demultiplexing. The stdlib
+``socket`` module has no ``sendmmsg()`` binding, so on Linux it is called
+through ctypes; elsewhere ``sendto()`` is used per packet. If the kernel buffer
+is full or a send fails, the rest of the batch is dropped (as the kernel would
+drop it anyway).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import socket
+import struct
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Kernel socket buffer request for streaming sockets (the kernel may clamp it,
+# e.g. to net.core.wmem_max / rmem_max on Linux)
+SOCKET_BUFFER_SIZE = 2 * 1024 * 1024
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+def tune_socket_buffers(sock, size: int = SOCKET_BUFFER_SIZE) -> None:
+    """Enlarge SO_SNDBUF/SO_RCVBUF so send bursts don't hit EAGAIN."""
+    if sock is None:
+        return
+    for opt, name in ((socket.SO_SNDBUF, "SO_SNDBUF"), (socket.SO_RCVBUF, "SO_RCVBUF")):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, opt, size)
+            actual = sock.getsockopt(socket.SOL_SOCKET, opt)
+        except OSError as e:
+            logger.debug("Could not set %s: %s", name, e)
+            continue
+        logger.debug(
+            "%s on port %d: requested %d, got %d",
+            name,
+            sock.getsockname()[1],
+            size,
+            actual,
+        )
+
+
+def bind_udp_socket(port: int, host: str = "0.0.0.0") -> socket.socket:
+    """Create a non-blocking UDP socket bound to (host, port)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setblocking(False)
+        sock.bind((host, port))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _load_sendmmsg():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fn = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [
+        ctypes.c_int,
+        ctypes.POINTER(_MMsgHdr),
+        ctypes.c_uint,
+        ctypes.c_int,
+    ]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_sendmmsg = _load_sendmmsg()
+
+
+def _sockaddr_in(addr: tuple[str, int]) -> ctypes.Array:
+    """Build a 16-byte ``struct sockaddr_in`` for an IPv4 (host, port)."""
+    host, port = addr[0], addr[1]
+    raw = struct.pack(
+        "=HH4s8x", socket.AF_INET, socket.htons(port), socket.inet_aton(host)
+    )
+    return ctypes.create_string_buffer(raw, len(raw))
+
+
+def _buffer_address(buf) -> tuple[int, object]:
+    """Return (address, keepalive) for a bytes-like object.
+
+    Read-only buffers other than bytes (e.g. a memoryview of bytes) are
+    copied to bytes first, as ctypes can only map writable ones.
+    """
+    if not isinstance(buf, bytes):
+        try:
+            ref = (ctypes.c_char * len(buf)).from_buffer(buf)
+        except TypeError:
+            buf = bytes(buf)
+        else:
+            return ctypes.addressof(ref), ref
+    ref = ctypes.c_char_p(buf)
+    return ctypes.cast(ref, ctypes.c_void_p).value, ref
+
+
+class BatchSender:
+    """Sends a list of datagrams to one address with as few syscalls as possible."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock: socket.socket | None = sock
+        self._fd = sock.fileno() if _sendmmsg else -1
+        self._capacity = 0
+        self._msgs: ctypes.Array | None = None
+        self._iovs: ctypes.Array | None = None
+        self._name_addr: tuple[str, int] | None = None
+        self._name: ctypes.Array | None = None
+
+    def send(self, packets: list, addr: tuple[str, int]) -> None:
+        sent = 0
+        if self._fd >= 0 and len(packets) > 1:
+            try:
+                sent = self._sendmmsg(packets, addr)
+            except OSError as e:
+                logger.debug("sendmmsg failed (%s), falling back to sendto", e)
+                sent = 0
+        if self._sock is not None:
+            try:
+                while sent < len(packets):
+                    self._sock.sendto(packets[sent], addr)
+                    sent += 1
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                # e.g. ENETUNREACH or a firewall EPERM: drop this batch rather
+                # than end the caller's stream loop
+                logger.debug(
+                    "sendto failed (%s), dropped %d packets", e, len(packets) - sent
+                )
+                return
+        if sent < len(packets):
+            logger.debug("Send buffer full, dropped %d packets", len(packets) - sent)
+
+    def close(self) -> None:
+        # The socket belongs to the server, which closes it
+        self._sock = None
+        self._fd = -1
+
+    def _sendmmsg(self, packets: list, addr: tuple[str, int]) -> int:
+        n = len(packets)
+        if n > self._capacity:
+            self._capacity = n
+            self._msgs = (_MMsgHdr * n)()
+            self._iovs = (_IOVec * n)()
+        if addr != self._name_addr:
+            self._name = _sockaddr_in(addr)
+            self._name_addr = addr
+
+        name_ptr = ctypes.addressof(self._name)
+        name_len = len(self._name)
+        keepalive = []
+        for k, pkt in enumerate(packets):
+            ptr, ref = _buffer_address(pkt)
+            keepalive.append(ref)
+            iov = self._iovs[k]
+            iov.iov_base = ptr
+            iov.iov_len = len(pkt)
+            hdr = self._msgs[k].msg_hdr
+            hdr.msg_name = name_ptr
+            hdr.msg_namelen = name_len
+            hdr.msg_iov = ctypes.pointer(iov)
+            hdr.msg_iovlen = 1
+
+        ret = _sendmmsg(self._fd, self._msgs, n, 0)
+        if ret < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return 0
+            raise OSError(err, "sendmmsg: " + errno.errorcode.get(err, str(err)))
+        return ret